@@ -4,7 +4,7 @@ from src.kz.read import read_bi_jk_ids
 from src.orthanc_scrapper import OrthancScrapper
 from src.utils.constants import STANDARD_FLAT_CHARACTERISTICS
 from src.utils.emails import send_dataframe_by_email, get_email_text, get_email_object, build_platform_jk_file_name
-from src.utils.formatting import format_prices_to_million_tenge
+from src.utils.formatting import format_prices_to_million_tenge, parse_price
 
 BI_BASE_FLAT_URL = 'https://bi.group/ru/flats?placementUUID='
 BI_BASE_URL = 'https://bi.group/ru/filter?'
@@ -29,9 +29,9 @@ def build_main_url_bi(city, jk_name='Nexpo', number_of_rooms=0):
 
 
 def scrap_bi(city='astana', jk_name='Aqua', number_of_rooms=1):
-    bi = KzBIGroup(city, jk_name, number_of_rooms)
-    bi.find_all_flats_urls_on_main_page()
-    bi.find_flats_characteristics()
+    with KzBIGroup(city, jk_name, number_of_rooms) as bi:
+        bi.find_all_flats_urls_on_main_page()
+        bi.find_flats_characteristics()
     return bi.weekly_comparison()
 
 
@@ -79,20 +79,18 @@ class KzBIGroup(OrthancScrapper):
     def find_flat_ids_from_img_urls(self):
         logger.info('Starting to find all flats ids from urls')
         element_urls = self.get_elements_by_path("//img[starts-with(@class,'MRE-jss')]")
-        for element_url in element_urls:
-            uid = element_url.get_attribute("src").split("/")[-2]
-            self.flat_urls.append(self.base_flat_url + uid)
-        self.flat_urls = list(set(self.flat_urls))
+        for img_url in self.get_attributes(element_urls, 'src'):
+            uid = img_url.split("/")[-2]
+            self.flat_urls.add(self.base_flat_url + uid)
 
     def find_flat_characteristics(self, flat_url):
         logger.info('Starting to find all flats characteristics')
-        self.init_webdriver()
         driver = self.driver
         driver.get(flat_url)
         try:
             flat_id = flat_url.split('=')[-1]
             element_price = self.get_element_by_path("//div[contains(text(),'Стоимость')]//following::div[1]")
-            price = float(element_price.text.replace(' ₸', '').replace(",", ""))
+            price = parse_price(element_price.text)
 
             element_floor = self.get_element_by_path("//div[contains(text(),'Этаж')]//following::div[1]")
             floor = element_floor.text
@@ -112,7 +110,7 @@ class KzBIGroup(OrthancScrapper):
         except Exception as e:
             logger.error('Failed to find flats characteristics for url:' + flat_url +
                          '\nReceived the following error' + str(e))
-            return STANDARD_FLAT_CHARACTERISTICS.copy()
+            return None
 
     def load_more(self):
         """
@@ -5,7 +5,7 @@ from src.kz.read import read_jk_ids_krisha
 from src.orthanc_scrapper import OrthancScrapper
 from src.utils.constants import STANDARD_FLAT_CHARACTERISTICS
 from src.utils.emails import send_dataframe_by_email, get_email_text, get_email_object, build_platform_jk_file_name
-from src.utils.formatting import format_prices_to_million_tenge
+from src.utils.formatting import format_prices_to_million_tenge, parse_price
 
 PLATFORM = 'Krisha'
 KRISHA_BASE_URL = 'https://krisha.kz/prodazha/kvartiry/'
@@ -16,9 +16,9 @@ logger = scrapper_logger(PLATFORM)
 
 
 def scrap_krisha(city='astana', jk_name='Nexpo', number_of_rooms=1):
-    krisha_scrapper = KrishaScrapper(city, jk_name, number_of_rooms)
-    krisha_scrapper.find_all_flats_urls_on_main_page()
-    krisha_scrapper.find_flats_characteristics()
+    with KrishaScrapper(city, jk_name, number_of_rooms) as krisha_scrapper:
+        krisha_scrapper.find_all_flats_urls_on_main_page()
+        krisha_scrapper.find_flats_characteristics()
     return krisha_scrapper.weekly_comparison()
 
 
@@ -31,7 +31,7 @@ def send_email_krisha(city='astana', jk_name='Nexpo', number_of_rooms=1):
 
 
 def build_main_url_krisha(city, number_of_rooms=0, jk_id=0):
-    main_url = KRISHA_BASE_URL + city + '/'
+    main_url = KRISHA_BASE_URL + city.lower() + '/'
     if number_of_rooms > 0:
         main_url += '?das[live.rooms]=' + str(number_of_rooms)
     if jk_id > 0:
@@ -66,31 +66,24 @@ class KrishaScrapper(OrthancScrapper):
         driver.get(self.main_url)
         elements = self.get_elements_by_path(
             "//div[starts-with(@class,'a-card a-storage-live ddl_product ddl_product_link not-colored is-visibl')]")
-        for element in elements:
-            uid = element.get_attribute("data-id")
-            self.flat_urls.append(self.base_flat_url + uid)
-        self.flat_urls = list(set(self.flat_urls))
+        for uid in self.get_attributes(elements, 'data-id'):
+            self.flat_urls.add(self.base_flat_url + uid)
         return self.flat_urls
 
     def find_flat_characteristics(self, flat_url):
         logger.info('Starting to find all flats characteristics')
-        self.init_webdriver()
         driver = self.driver
         driver.get(flat_url)
         try:
             flat_id = flat_url.split('/')[-1]
             element_price = self.get_element_by_path("//div[starts-with(@class,'offer__price')]")
-            price = float(element_price.text.replace(' \n〒', '').replace(",", "").replace(" ", ""))
+            price = parse_price(element_price.text)
 
             element_floor = self.get_element_by_path("//div[starts-with(@data-name,'flat.floor')]//following::div[3]")
-            floor = element_floor.text
-            if 'из' in floor:
-                floor, max_floor = floor.split('из')
-                max_floor = int(max_floor)
-            else:
-                floor = floor
-                max_floor = 0
+            # floor is either 'x из y' or just 'x' when the number of floors is not given
+            floor, _, max_floor = element_floor.text.partition('из')
             floor = int(floor)
+            max_floor = int(max_floor) if max_floor else 0
 
             element_surface = self.get_element_by_path(
                 "//div[starts-with(@data-name,'live.square')]//following::div[3]")
@@ -104,4 +97,4 @@ class KrishaScrapper(OrthancScrapper):
         except Exception as e:
             logger.error('Failed to find flats characteristics for url:' + flat_url +
                          '\nReceived the following error' + str(e))
-            return STANDARD_FLAT_CHARACTERISTICS.copy()
+            return None
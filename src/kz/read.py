@@ -1,13 +1,18 @@
+from functools import lru_cache
+from types import MappingProxyType
+
 import pandas as pd
 
 
+@lru_cache(maxsize=None)
 def read_jk_ids_krisha():
     jk_ids = pd.read_csv('src/kz/resources/krisha_jk_ids.csv')
     #jk_ids = pd.read_csv('../src/kz/resources/krisha_jk_ids.csv')
-    return dict(jk_ids.values)
+    return MappingProxyType(dict(jk_ids.values))
 
 
+@lru_cache(maxsize=None)
 def read_bi_jk_ids():
     jk_ids = pd.read_csv('src/kz/resources/bi_jk_ids.csv')
     #jk_ids = pd.read_csv('../src/kz/resources/bi_jk_ids.csv')
-    return dict(jk_ids.values)
+    return MappingProxyType(dict(jk_ids.values))
@@ -1,5 +1,6 @@
 import datetime
 import logging
+from functools import lru_cache
 
 import pandas as pd
 from selenium import webdriver
@@ -10,15 +11,13 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 
-from src.utils import root_folder
+from src.utils.constants import PATH_TO_DATA, FLAT_CHARACTERISTICS_COLUMNS
 from src.utils.dates import get_last_tuesday_of_last_month, get_tuesday_of_last_week
 from src.utils.formatting import format_price_to_million_tenge
-
-root_folder.determine_root_folder()
-from src.utils.constants import PATH_TO_DATA
 from src.utils.logger import scrapper_logger, logger_init
 
 SCRAPING_TIMEOUT = 30
+SAVED_FLATS_DTYPES = {'Id': str, 'Number Of Floors': int, 'Floor': int}
 logging.getLogger('WDM').setLevel(logging.NOTSET)
 
 logger = scrapper_logger('Orthanc')
@@ -31,16 +30,39 @@ def get_selenium_scraping_options():
     options.add_argument('--disable-dev-shm-usage')
     options.add_argument('--disable-blink-features=AutomationControlled')
     options.add_argument('start-maximized')
+    options.add_argument('--user-agent=' + get_user_agent())
     options.add_experimental_option('excludeSwitches', ['enable-automation'])
     options.add_experimental_option('useAutomationExtension', False)
     return options
 
 
+@lru_cache(maxsize=None)
+def get_chrome_driver_path():
+    """
+    Resolves (and downloads if needed) the chromedriver binary once per process
+    :return: str, path to the chromedriver executable
+    """
+    return ChromeDriverManager().install()
+
+
 def get_user_agent():
     return 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/60.0.3112.50 ' \
            'Safari/537.36 '
 
 
+def index_flats_by_characteristics(flats):
+    """
+    Index flats on the characteristics used to recognise an add that was removed and put back
+    :param flats: pd.DataFrame, flats with at least the Id, Surface, Floor, Number Of Floors and Price columns
+    :return: dict, (surface, floor, max_floor) -> list of (id, price) in the order of the df
+    """
+    index = {}
+    columns = ['Id', 'Surface', 'Floor', 'Number Of Floors', 'Price']
+    for flat_id, surface, floor, max_floor, price in flats[columns].itertuples(index=False):
+        index.setdefault((surface, floor, max_floor), []).append((flat_id, price))
+    return index
+
+
 class OrthancScrapper:
     """
     Base class used to scrap different RE websites
@@ -57,31 +79,46 @@ class OrthancScrapper:
         """
         logger_init(logger)
         self.driver = None
-        self.flat_urls = []
+        self.flat_urls = set()
         self.country = country
         self.data_path = PATH_TO_DATA + country + '/'
         self.flats_characteristics = flat_characteristics_df
         self.file_name = file_name
         self.main_url = main_url
         self.base_flat_url = base_flat_url
-        self.init_webdriver()
+        # read last week first so a missing file fails before any browser is started
         self.last_week_flats = self.read_last_week()
+        self.last_week_index = index_flats_by_characteristics(self.last_week_flats)
+        self.init_webdriver()
 
     def init_webdriver(self, trials=5):
         if trials > 0:
             logger.info('Initializing ' + logger.name + "'s driver")
             try:
-                driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()),
-                                          options=get_selenium_scraping_options())
-                user_agent = get_user_agent()
-                driver.execute_cdp_cmd('Network.setUserAgentOverride', {'userAgent': user_agent})
-                self.driver = driver
+                self.driver = webdriver.Chrome(service=Service(get_chrome_driver_path()),
+                                               options=get_selenium_scraping_options())
             except:
                 logger.error('Failed to init driver. Trying again.')
                 self.init_webdriver(trials - 1)
         else:
             logger.error('Failed to init driver despite multiple trials.')
 
+    def close(self):
+        """
+        Quits the webdriver and the browser behind it
+        :return:
+        """
+        if self.driver is not None:
+            logger.info('Closing ' + logger.name + "'s driver")
+            self.driver.quit()
+            self.driver = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def get_element_by_path(self, element_to_look_for):
         """
         Given a htnl element to look for (class etc) try to find it
@@ -118,6 +155,18 @@ class OrthancScrapper:
         except Exception as e:
             logger.error('Failed to find element at url: ' + self.driver.current_url + '\nError is:' + str(e))
 
+    def get_attributes(self, elements, attribute):
+        """
+        Reads the same attribute of several elements in one call to the browser instead of one call per element
+        :param elements: list of WebElement
+        :param attribute: str, eg: data-id
+        :return: list of str
+        """
+        return self.driver.execute_script(
+            'var attribute = arguments[1];'
+            'return arguments[0].map(function (element) {return element.getAttribute(attribute);});',
+            elements, attribute)
+
     def click_button(self, button_class_to_find):
         """
         Given the html code of a button, finds it and clicks on it
@@ -140,7 +189,7 @@ class OrthancScrapper:
         To implement by the child class
 
         :param flat_url:
-        :return:
+        :return: tuple, the flat's row as returned by package_flat_characteristics, None if it could not be scrapped
         """
         raise Exception('find_flat_characteristics not implemented')
 
@@ -150,39 +199,32 @@ class OrthancScrapper:
         :return:
         """
         logger.info('Starting to find flats characteristics')
-        flats_characteristics = self.flats_characteristics
-        for url in self.flat_urls:
-            flat_characteristics = self.find_flat_characteristics(url)
-            flats_characteristics = pd.concat([flats_characteristics, flat_characteristics])
+        flats = [self.find_flat_characteristics(url) for url in self.flat_urls]
+        flats = pd.DataFrame([flat for flat in flats if flat is not None], columns=FLAT_CHARACTERISTICS_COLUMNS)
+        flats_characteristics = pd.concat([self.flats_characteristics, flats])
         flats_characteristics = flats_characteristics.sort_values(by=['Entrance', 'Number Of Floors'])
         self.flats_characteristics = flats_characteristics.reset_index(drop=True)
         self.save_flats_to_file()
         return flats_characteristics
 
     def package_flat_characteristics(self, flat_id, entrance, max_floor, floor, surface, price, flat_url):
-        last_week_flats = self.last_week_flats.copy()
-        similar_flats_last_week = last_week_flats.loc[
-            (last_week_flats['Surface'] == surface) &
-            (last_week_flats['Floor'] == floor) &
-            (last_week_flats['Number Of Floors'] == max_floor)
-            ]
+        similar_flats_last_week = self.last_week_index.get((surface, floor, max_floor), [])
         # check if flat was already here last week but the add was removed and put back
         # so it has a different flat_id but all the same characteristics
         if len(similar_flats_last_week) > 0:
-            flat_id = similar_flats_last_week['Id'].values[0]
+            flat_id = similar_flats_last_week[0][0]
             # if more than one similar flat, filter on price
             if len(similar_flats_last_week) > 1:
-                similar_flats_last_week = similar_flats_last_week.loc[(last_week_flats['Price'] == price)]
-                if len(similar_flats_last_week) > 0:
-                    flat_id = similar_flats_last_week['Id'].values[0]
-        return pd.DataFrame([[flat_id, entrance, max_floor, floor, surface, price, flat_url]],
-                            columns=['Id', 'Entrance', 'Number Of Floors', 'Floor', 'Surface', 'Price', 'Link'])
+                same_price_ids = [similar_id for similar_id, similar_price in similar_flats_last_week
+                                  if similar_price == price]
+                if len(same_price_ids) > 0:
+                    flat_id = same_price_ids[0]
+        return flat_id, entrance, max_floor, floor, surface, price, flat_url
 
     def save_flats_to_file(self):
         logger.info('Saving flats characteristics')
         today = datetime.datetime.today().strftime('%Y-%m-%d')
-        flats = self.flats_characteristics.copy()
-        flats.to_csv(self.data_path + today + '_' + self.file_name + '.csv', index=False)
+        self.flats_characteristics.to_csv(self.data_path + today + '_' + self.file_name + '.csv', index=False)
 
     def count_by_building(self):
         logger.info('Counting flats by buildings/entrances')
@@ -190,43 +232,31 @@ class OrthancScrapper:
 
     def get_flats_between_floors(self, floor_from, floor_to):
         logger.info('Filtering flats between min floor=' + str(floor_from) + 'and max floor=' + str(floor_to))
-        filtered_flats = self.flats_characteristics.copy()
-        filtered_flats = filtered_flats.loc[(filtered_flats['Floor'] >= floor_from) &
-                                            (filtered_flats['Floor'] <= floor_to)]
-        return filtered_flats
+        flats = self.flats_characteristics
+        return flats.loc[flats['Floor'].between(floor_from, floor_to)]
 
     def weekly_comparison(self):
         last_week_flats = self.last_week_flats.copy()
         this_week_flats = self.flats_characteristics.copy()
-        ids_last_week = last_week_flats['Id'].unique().tolist()
-        ids_this_week = this_week_flats['Id'].unique().tolist()
-        all_ids = set(ids_this_week + ids_last_week)
-        # get status of flats (New, Sold, NA)
-        status = {}
-        for flat_id in all_ids:
-            flat_status = 'NA'
-            last_week_flats.loc[last_week_flats['Id'] == flat_id, 'Status'] = 'NA'
-            if (flat_id in ids_last_week) & (flat_id not in ids_this_week):
-                flat_status = 'sold'
-                last_week_flats.loc[last_week_flats['Id'] == flat_id, 'Status'] = 'Sold'
-            if (flat_id in ids_this_week) & (flat_id not in ids_last_week):
-                flat_status = 'new'
-                this_week_flats.loc[this_week_flats['Id'] == flat_id, 'Status'] = 'New'
-            status[flat_id] = flat_status
+        # get status of flats: new if only listed this week, sold if only listed last week
+        is_new = ~this_week_flats['Id'].isin(last_week_flats['Id'])
+        is_sold = ~last_week_flats['Id'].isin(this_week_flats['Id'])
+        this_week_flats['Status'] = is_new.map({True: 'New', False: None})
+        last_week_flats['Status'] = is_sold.map({True: 'Sold', False: None})
+        common_ids = this_week_flats.loc[~is_new, 'Id'].unique()
 
         # Add sold flats to current flats
-        this_week_flats = pd.concat([this_week_flats, last_week_flats.loc[last_week_flats['Status'] == 'Sold']])
-
-        for flat_id in all_ids:
-            if status[flat_id] == 'NA':
-                price_last_week = last_week_flats.loc[last_week_flats['Id'] == flat_id, 'Price'].values[0]
-                price_this_week = this_week_flats.loc[this_week_flats['Id'] == flat_id, 'Price'].values[0]
-                delta = price_this_week - price_last_week
-                change = delta / price_last_week
-                this_week_flats.loc[this_week_flats['Id'] == flat_id, 'Price Delta'] = \
-                    '-' if delta == 0 else format_price_to_million_tenge(delta)
-                this_week_flats.loc[this_week_flats['Id'] == flat_id, 'Price Change'] = \
-                    '-' if change == 0 else str(round(change * 100, 2)) + '%'
+        this_week_flats = pd.concat([this_week_flats, last_week_flats.loc[is_sold]])
+
+        # compare prices of flats present both weeks, taking the first listing of each id once
+        prices_last_week = last_week_flats.drop_duplicates(subset='Id').set_index('Id')['Price'][common_ids]
+        prices_this_week = this_week_flats.drop_duplicates(subset='Id').set_index('Id')['Price'][common_ids]
+        delta = prices_this_week - prices_last_week
+        change = delta / prices_last_week
+        this_week_flats['Price Delta'] = this_week_flats['Id'].map(
+            delta.apply(lambda x: '-' if x == 0 else format_price_to_million_tenge(x)))
+        this_week_flats['Price Change'] = this_week_flats['Id'].map(
+            change.apply(lambda x: '-' if x == 0 else str(round(x * 100, 2)) + '%'))
         this_week_flats = this_week_flats.sort_values('Status', ascending=False, na_position='last')
         this_week_flats = this_week_flats.fillna('-')
         this_week_flats = this_week_flats.reset_index(drop=True)
@@ -238,8 +268,4 @@ class OrthancScrapper:
 
     def read_last_week(self):
         last_week = get_tuesday_of_last_week().strftime('%Y-%m-%d')
-        last_week_flats = pd.read_csv(self.data_path + last_week + '_' + self.file_name + '.csv')
-        last_week_flats['Id'] = last_week_flats['Id'].astype(str)
-        last_week_flats['Number Of Floors'] = last_week_flats['Number Of Floors'].astype(int)
-        last_week_flats['Floor'] = last_week_flats['Floor'].astype(int)
-        return last_week_flats
+        return pd.read_csv(self.data_path + last_week + '_' + self.file_name + '.csv', dtype=SAVED_FLATS_DTYPES)
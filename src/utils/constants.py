@@ -8,5 +8,5 @@ LOGGING_FORMAT = '%(asctime)s:%(levelname)s:%(funcName)s:%(lineno)d:%(message)s'
 LOGGING_PATH = root_folder.ROOT_FOLDER + 'logs/Orthanc/'
 PATH_TO_PASSWORDS = root_folder.ROOT_FOLDER + 'keys/'
 
-STANDARD_FLAT_CHARACTERISTICS = pd.DataFrame(
-    columns=['Id', 'Entrance', 'Number Of Floors', 'Floor', 'Surface', 'Price', 'Link'])
+FLAT_CHARACTERISTICS_COLUMNS = ['Id', 'Entrance', 'Number Of Floors', 'Floor', 'Surface', 'Price', 'Link']
+STANDARD_FLAT_CHARACTERISTICS = pd.DataFrame(columns=FLAT_CHARACTERISTICS_COLUMNS)
@@ -8,18 +8,17 @@ from dateutil.relativedelta import relativedelta, TU
 def get_last_tuesday_of_last_month():
     today = datetime.datetime.today()
     last_tuesday = get_last_tuesday_of_the_month(today.year, today.month - 1)
-    return pd.to_datetime(last_tuesday.date())
+    return pd.Timestamp(last_tuesday.date())
 
 
 def get_last_tuesday_of_this_month():
     today = datetime.datetime.today()
     last_tuesday = get_last_tuesday_of_the_month(today.year, today.month)
-    return pd.to_datetime(last_tuesday.date())
+    return pd.Timestamp(last_tuesday.date())
 
 
 def get_last_tuesday_of_the_month(year, month):
-    return pd.to_datetime((datetime.datetime(year, month, 1) + relativedelta(day=31, weekday=TU(-1))),
-                          format=DATE_FORMAT)
+    return pd.Timestamp(datetime.datetime(year, month, 1) + relativedelta(day=31, weekday=TU(-1)))
 
 
 def get_last_tuesday():
@@ -42,6 +41,3 @@ def get_tuesday_of_last_week_before_date(day):
 
 def get_tuesday_of_last_week():
     return get_tuesday_of_last_week_before_date(datetime.date.today())
-
-
-DATE_FORMAT = '%d/%m/%Y'
@@ -10,6 +10,9 @@ from smtplib import SMTP_SSL as SMTP
 from pretty_html_table import build_table
 
 from src.utils.constants import PATH_TO_PASSWORDS
+from src.utils.logger import scrapper_logger
+
+logger = scrapper_logger('Emails')
 
 
 def send_email(sender, sender_name, receivers, user, password, content, subject, content_format='txt',
@@ -48,18 +51,16 @@ def send_email(sender, sender_name, receivers, user, password, content, subject,
             part.add_header('Content-Disposition',
                             'attachment; filename="%s"' % plot_to_send.figure.axes[0].get_title() + '.png')
             msg.attach(part)
-        conn = SMTP('boite.o2switch.net')
-        conn.set_debuglevel(True)
-        conn.login(user, password)
-        try:
-            conn.sendmail(sender, receivers, msg.as_string())
-            print('Email is Sent')
-        except Exception as e:
-            print(e)
-        finally:
-            conn.quit()
+        with SMTP('boite.o2switch.net') as conn:
+            conn.login(user, password)
+            try:
+                conn.sendmail(sender, receivers, msg.as_string())
+                logger.info('Email is sent to: ' + ','.join(receivers))
+            except Exception as e:
+                logger.error('Failed to send email.\nError:' + str(e))
     except Exception as e:
-        sys.exit('mail failed; %s' % 'e')
+        logger.error('Mail failed.\nError:' + str(e))
+        sys.exit('mail failed; %s' % e)
 
 
 def send_email_from_ops(receivers, content, subject, content_format='txt', plot_to_send=None):
@@ -1,6 +1,24 @@
+import re
+
+# first number of the text, digits possibly grouped by spaces or commas, eg: 25 000 000 or 25,000,000.5
+PRICE_NUMBER = re.compile(r'\d[\d \u00a0\u202f,]*(?:\.\d+)?')
+PRICE_SEPARATORS = re.compile(r'[ \u00a0\u202f,]')
+
+
 def format_price_to_million_tenge(price):
     return str(round(price / 1e6, 2)) + 'M₸'
 
 
 def format_prices_to_million_tenge(prices):
-    return prices.apply(lambda x: format_price_to_million_tenge(x))
+    return prices.map(format_price_to_million_tenge)
+
+
+def parse_price(price_text):
+    """
+    :param price_text: str, price as displayed on a website, eg: '25 000 000 〒' or '25,000,000 ₸'
+    :return: float, the first price of the text without currency sign nor thousands separators
+    """
+    price = PRICE_NUMBER.search(price_text)
+    if price is None:
+        raise ValueError('No price found in: ' + price_text)
+    return float(PRICE_SEPARATORS.sub('', price.group()))
@@ -9,10 +9,11 @@ def scrapper_logger(name):
     :param name: str, name of the scrapper we are working with
     :return: logging.Logger, the logger associated with this fund, with specific path and logs names
     """
-    logging_time = dt.datetime.now().strftime('%Y-%m-%d')
     logger = logging.getLogger(name)
-    if logger.hasHandlers():
-        logger.handlers.clear()
+    if logger.handlers:
+        # already set up in this process (module import then launch script), keep its open log file
+        return logger
+    logging_time = dt.datetime.now().strftime('%Y-%m-%d')
     logger.setLevel(logging.INFO)
 
     formatter = logging.Formatter(LOGGING_FORMAT)
@@ -7,3 +7,6 @@ def determine_root_folder():
         ROOT_FOLDER = 'C:/dev/'
     else:
         ROOT_FOLDER = '/home/mev/'
+
+
+determine_root_folder()